@@ -2,25 +2,82 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
 import plotly.graph_objects as go
 from pathlib import Path
 from datetime import datetime
+import csv
+import gc
+import hashlib
+import io
 import json
 import logging
-from typing import Optional, Dict, Any
+import time
+import uuid
+from typing import Optional, Dict, Any, List, Tuple
 
 from utils.styling import apply_custom_style, create_metric_card, create_info_card, COLORS, create_leaderboard_visualization, create_contributor_profile, initialize_session_state
-from utils.analysis import analyze_contributors, AnalysisError, generate_contributor_summary
+from utils.analysis import analyze_contributors, AnalysisError, generate_contributor_summary, frame_fingerprint, index_by_username
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Constants
-CACHE_DIR = Path("data/cache")
+CACHE_DIR = Path(__file__).parent / "data" / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Version du format des fichiers en cache : à incrémenter à chaque changement de _read_upload
+UPLOAD_CACHE_VERSION = 1
+
+# Limites du cache disque des fichiers téléversés (taille totale et âge maximal)
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Signatures des fichiers Excel : archive ZIP (xlsx) et conteneur OLE2 (xls)
+XLSX_SIGNATURE = b"PK\x03\x04"
+XLS_SIGNATURE = b"\xd0\xcf\x11\xe0"
+
+# Colonnes normalisées et leur colonne source dans les exports (None : valeur par défaut)
+UPLOAD_COLUMNS = {
+    "bytes_added": ("mainspace_bytes_added", 0),
+    "articles_created": ("total_articles_created", 0),
+    "articles_edited": ("total_articles_edited", 0),
+    "references_added": ("references_added", 0),
+    "upload_count": (None, 0),
+    "www.wikidata.org_edits": (None, 0),
+    "total_edits": ("revisions_during_project", 0),
+    "username": ("username", "Unknown")
+}
+
+# Colonnes utilisées dans les exports de fichiers Commons
+COMMONS_COLUMNS = ("username", "filename", "usage_count")
+
+# Types connus des colonnes CSV : évite l'inférence de type et garde les noms en texte
+CSV_COLUMN_TYPES = {
+    "username": pa.string(),
+    "filename": pa.string(),
+    "mainspace_bytes_added": pa.int64(),
+    "total_articles_created": pa.int32(),
+    "total_articles_edited": pa.int32(),
+    "references_added": pa.int32(),
+    "revisions_during_project": pa.int32(),
+    "usage_count": pa.int32()
+}
+
+# Fragment du message d'Arrow quand une valeur ne correspond pas au type déclaré
+CSV_CONVERSION_ERROR = "CSV conversion error"
+
+# Au-delà de cette taille, la mémoire des tampons intermédiaires est récupérée explicitement
+LARGE_UPLOAD_BYTES = 50 * 1024 * 1024
+
+# Fragments Streamlit (>= 1.33) : seule la section concernée est réexécutée ;
+# sur les versions antérieures la fonction s'exécute avec le reste du script
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
 def ensure_required_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Ensure all required columns exist, creating them with default values if missing"""
     required_columns = {
@@ -34,125 +91,255 @@ def ensure_required_columns(df: pd.DataFrame) -> pd.DataFrame:
         "www.wikidata.org_edits": int
     }
     
-    for col, dtype in required_columns.items():
-        if col not in df.columns:
-            st.warning(f"Colonne manquante '{col}' créée avec des valeurs par défaut")
-            if dtype == int:
-                df[col] = 0
-            else:
-                df[col] = "Unknown"
+    missing = {
+        col: (0 if dtype is int else "Unknown")
+        for col, dtype in required_columns.items()
+        if col not in df.columns
+    }
+    
+    if missing:
+        st.warning(f"Colonnes manquantes créées avec des valeurs par défaut : {', '.join(missing)}")
+        # Insertion groupée : une seule concaténation au lieu d'un ajout par colonne
+        defaults_df = pd.DataFrame(
+            {col: np.full(len(df), value) for col, value in missing.items()},
+            index=df.index
+        )
+        df = pd.concat([df, defaults_df], axis=1, copy=False)
     
     return df
 
-def load_data(uploaded_file, data_type: str = "editors"):
-    """Load and validate uploaded data"""
-    try:
-        # Lecture du fichier selon son extension
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file)
-        else:
-            st.error("Format de fichier non supporté. Veuillez téléverser un fichier CSV ou Excel.")
-            return None
+def _csv_header(file_bytes: bytes) -> List[str]:
+    """Column names from the first CSV record, without parsing the rest of the file"""
+    text = io.TextIOWrapper(io.BytesIO(file_bytes), encoding="utf-8-sig", errors="replace", newline="")
+    return next(csv.reader(text), [])
+
+def _read_upload(file_bytes: bytes, data_type: str) -> pd.DataFrame:
+    """Parse an uploaded file and normalize its columns"""
+    # Seules les colonnes utilisées sont converties en DataFrame
+    if data_type == "commons":
+        wanted_columns = set(COMMONS_COLUMNS)
+    else:
+        wanted_columns = {old_col for old_col, _ in UPLOAD_COLUMNS.values() if old_col}
+    
+    # Détection du format d'après les premiers octets plutôt que l'extension
+    if file_bytes.startswith((XLSX_SIGNATURE, XLS_SIGNATURE)):
+        # Moteur calamine (Rust) : lit le xlsx comme l'ancien xls, sans openpyxl ni xlrd
+        df = pd.read_excel(
+            io.BytesIO(file_bytes),
+            engine="calamine",
+            usecols=lambda col: col in wanted_columns
+        )
+    else:
+        # En-tête lu seul : Arrow ne parse et ne convertit ensuite que les colonnes utiles
+        include_columns = [col for col in _csv_header(file_bytes) if col in wanted_columns]
         
-        # Traitement spécial pour les données Commons
-        if data_type == "commons":
-            # Vérification des colonnes requises
-            if 'username' not in df.columns or 'filename' not in df.columns:
-                st.error("Le fichier Commons doit contenir les colonnes 'username' et 'filename'")
-                return None
-            
-            # Affiche les premières lignes pour debug
-            logger.info(f"Premières lignes du DataFrame:\n{df.head()}")
-            logger.info(f"Types des colonnes:\n{df.dtypes}")
-            
-            # Compte le nombre de fichiers par utilisateur
-            uploads_per_user = df.groupby('username').agg({
-                'filename': 'count',  # Compte tous les fichiers
-                'usage_count': lambda x: x.fillna(0).sum()  # Somme des utilisations
-            }).reset_index()
-            
-            # Renomme les colonnes pour la clarté
-            uploads_per_user = uploads_per_user.rename(columns={
-                'filename': 'upload_count'
-            })
-            
-            # Calcul des points (3 points par fichier)
-            uploads_per_user['upload_points'] = uploads_per_user['upload_count'] * 3
-            
-            # Log des statistiques pour le débogage
-            logger.info(f"Statistiques des uploads:")
-            logger.info(f"Total fichiers: {uploads_per_user['upload_count'].sum()}")
-            logger.info(f"Total utilisateurs: {len(uploads_per_user)}")
-            logger.info(f"Données traitées:\n{uploads_per_user}")
-            
-            # Initialisation des autres colonnes requises avec des valeurs par défaut
-            uploads_per_user['bytes_added'] = 0
-            uploads_per_user['articles_created'] = 0
-            uploads_per_user['articles_edited'] = uploads_per_user['usage_count']
-            uploads_per_user['references_added'] = 0
-            uploads_per_user['www.wikidata.org_edits'] = 0
-            uploads_per_user['total_edits'] = uploads_per_user['upload_count']
-            
-            return uploads_per_user
-            
-        # Pour les autres types de données, utilise le traitement standard
-        required_columns = {
-            "bytes_added": ("mainspace_bytes_added", 0),
-            "articles_created": ("total_articles_created", 0),
-            "articles_edited": ("total_articles_edited", 0),
-            "references_added": ("references_added", 0),
-            "upload_count": (None, 0),
-            "www.wikidata.org_edits": (None, 0),
-            "total_edits": ("revisions_during_project", 0),
-            "username": ("username", "Unknown")
-        }
+        # Lecteur CSV natif d'Arrow, multi-thread et plus rapide que pd.read_csv
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+        # Champs entre guillemets sur plusieurs lignes (descriptions Commons), comme pd.read_csv
+        parse_options = pacsv.ParseOptions(newlines_in_values=True)
+        try:
+            table = pacsv.read_csv(
+                io.BytesIO(file_bytes),
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=pacsv.ConvertOptions(
+                    column_types=CSV_COLUMN_TYPES,
+                    include_columns=include_columns,
+                    strings_can_be_null=True
+                )
+            )
+        except pa.ArrowInvalid as e:
+            # Seules les erreurs de conversion (ex. « 12.0 » dans une colonne entière)
+            # justifient une relecture avec inférence ; un CSV mal formé échouerait de même
+            if CSV_CONVERSION_ERROR not in str(e):
+                raise
+            logger.warning(f"Typed CSV read failed, falling back to type inference: {e}")
+            table = pacsv.read_csv(
+                io.BytesIO(file_bytes),
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=pacsv.ConvertOptions(
+                    column_types={"username": pa.string(), "filename": pa.string()},
+                    include_columns=include_columns,
+                    strings_can_be_null=True
+                )
+            )
+        if not include_columns:
+            # Liste vide : Arrow aurait gardé toutes les colonnes
+            table = table.select([])
+        df = table.to_pandas(self_destruct=True, split_blocks=True)
+        del table
+    
+    # Traitement spécial pour les données Commons
+    if data_type == "commons":
+        # Vérification des colonnes requises
+        if 'username' not in df.columns or 'filename' not in df.columns:
+            raise AnalysisError("Le fichier Commons doit contenir les colonnes 'username' et 'filename'")
         
-        # Création d'un nouveau DataFrame avec les colonnes requises
-        processed_df = pd.DataFrame()
+        # Catégoriel : le groupby travaille sur des codes entiers plutôt que des chaînes
+        df['username'] = df['username'].astype('category')
         
-        # Copie et renomme les colonnes existantes, ou crée avec valeurs par défaut
-        for new_col, (old_col, default_val) in required_columns.items():
-            if old_col and old_col in df.columns:
-                processed_df[new_col] = df[old_col].fillna(default_val)
-            else:
-                processed_df[new_col] = default_val
+        # Affiche les premières lignes pour debug (formatage coûteux, seulement en DEBUG)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Premières lignes du DataFrame:\n%s", df.head())
+            logger.debug("Types des colonnes:\n%s", df.dtypes)
+        
+        # Compte le nombre de fichiers et somme des utilisations par utilisateur
+        # (agrégations nommées vectorisées, 'sum' ignore déjà les NaN)
+        uploads_per_user = df.groupby('username', sort=False, observed=True).agg(
+            upload_count=('filename', 'size'),  # Compte tous les fichiers
+            usage_count=('usage_count', 'sum')  # Somme des utilisations
+        ).reset_index()
+        
+        # Calcul des points (3 points par fichier)
+        uploads_per_user['upload_points'] = uploads_per_user['upload_count'] * 3
+        
+        # Log des statistiques (valeurs scalaires uniquement)
+        logger.info(
+            "Statistiques des uploads: %d utilisateurs, %d fichiers",
+            len(uploads_per_user),
+            int(uploads_per_user['upload_count'].sum())
+        )
+        
+        # Initialisation des autres colonnes requises avec des valeurs par défaut
+        uploads_per_user['bytes_added'] = 0
+        uploads_per_user['articles_created'] = 0
+        uploads_per_user['articles_edited'] = uploads_per_user['usage_count']
+        uploads_per_user['references_added'] = 0
+        uploads_per_user['www.wikidata.org_edits'] = 0
+        uploads_per_user['total_edits'] = uploads_per_user['upload_count']
         
-        return processed_df
+        return uploads_per_user
         
+    # Pour les autres types de données, utilise le traitement standard
+    # Création d'un nouveau DataFrame avec les colonnes requises
+    processed_df = pd.DataFrame()
+    
+    # Copie et renomme les colonnes existantes, ou crée avec valeurs par défaut
+    for new_col, (old_col, default_val) in UPLOAD_COLUMNS.items():
+        if old_col and old_col in df.columns:
+            processed_df[new_col] = df[old_col].fillna(default_val)
+        else:
+            processed_df[new_col] = default_val
+    
+    # Catégoriel : les filtres et regroupements sur l'utilisateur comparent des entiers
+    processed_df["username"] = processed_df["username"].astype("category")
+    
+    return processed_df
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _parse_upload(file_bytes: bytes, data_type: str) -> pd.DataFrame:
+    """Parse and normalize an uploaded file, cached on its raw bytes"""
+    # Cache disque partagé entre les sessions : un fichier déjà vu est relu en Feather
+    # (la version du format fait partie du nom, un ancien fichier n'est jamais relu)
+    key = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+    cache_path = CACHE_DIR / f"v{UPLOAD_CACHE_VERSION}_{key}_{data_type}.feather"
+    
+    if cache_path.exists():
+        try:
+            df = pd.read_feather(cache_path)
+            cache_path.touch()  # Date d'accès pour l'éviction LRU
+            return df
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Unreadable cache file {cache_path}: {e}")
+    
+    try:
+        df = _read_upload(file_bytes, data_type)
+    finally:
+        if len(file_bytes) > LARGE_UPLOAD_BYTES:
+            gc.collect()
+    
+    # Écriture dans un fichier temporaire puis renommage pour ne jamais laisser de fichier partiel
+    tmp_path = cache_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    try:
+        feather.write_feather(df, tmp_path, compression="lz4")
+        tmp_path.replace(cache_path)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"Could not write cache file {cache_path}: {e}")
+        tmp_path.unlink(missing_ok=True)
+    
+    _prune_upload_cache()
+    return df
+
+def _prune_upload_cache():
+    """Remove expired or old-format cache files, then the least recently used beyond CACHE_MAX_BYTES"""
+    current_prefix = f"v{UPLOAD_CACHE_VERSION}_"
+    expiry = time.time() - CACHE_MAX_AGE_SECONDS
+    entries = []
+    for path in CACHE_DIR.glob("*.feather"):
+        try:
+            stat = path.stat()
+            if not path.name.startswith(current_prefix) or stat.st_mtime < expiry:
+                path.unlink()
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            continue  # Fichier supprimé entre-temps par une autre session
+    
+    # Plus récents d'abord : on garde tant que le total reste sous la limite
+    total = 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0], reverse=True):
+        total += size
+        if total > CACHE_MAX_BYTES:
+            path.unlink(missing_ok=True)
+
+def load_data(uploaded_file, data_type: str = "editors"):
+    """Load and validate uploaded data"""
+    try:
+        # Les octets bruts servent de clé de cache : un fichier inchangé n'est pas relu
+        return _parse_upload(uploaded_file.getvalue(), data_type)
+        
+    except AnalysisError as e:
+        st.error(str(e))
+        return None
     except Exception as e:
         st.error(f"Erreur lors du chargement des données : {str(e)}")
         logger.error(f"Data loading error: {e}")
-        logger.error(f"Available columns: {df.columns.tolist() if 'df' in locals() else 'No DataFrame'}")
         return None
 
-def create_contributor_profile(metrics: pd.DataFrame, contributor: str):
-    """Create a detailed contributor profile visualization"""
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _analyze(df: pd.DataFrame, data_type: str) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float]]:
+    """Cached wrapper around analyze_contributors, also returning the username index and score aggregates"""
+    metrics = analyze_contributors(df, data_type=data_type)
+    metrics_by_user = None
+    score_summary = {}
+    
+    if not metrics.empty:
+        # Conversion unique en entiers des compteurs affichés dans les profils
+        int_columns = ["upload_count", "Rang"]
+        metrics[int_columns] = metrics[int_columns].fillna(0).astype("int64")
+        
+        # Agrégats calculés une fois sur le tableau NumPy et mis en cache avec les métriques
+        scores = metrics["Score global"].to_numpy()
+        score_summary = {"mean": float(np.nanmean(scores)), "median": float(np.nanmedian(scores))}
+        
+        # Index par utilisateur construit une fois par analyse, pas à chaque réexécution
+        metrics_by_user = index_by_username(metrics)
+    
+    return metrics, metrics_by_user, score_summary
+
+def create_contributor_profile(metrics_by_user: pd.DataFrame, contributor: str):
+    """Create a detailed contributor profile visualization from metrics indexed by username"""
     try:
-        user_data = metrics[metrics["username"] == contributor].iloc[0]
+        # Recherche directe dans l'index au lieu d'un filtre sur toute la colonne
+        position = metrics_by_user.index.get_indexer([contributor])[0]
+        if position == -1:
+            st.warning("Données du contributeur non disponibles.")
+            return
+        user_data = metrics_by_user.iloc[position]
         
         # En-tête du profil
         st.markdown(f"### 👤 Profil de {contributor}")
         
-        # Fonction utilitaire pour convertir en entier de manière sécurisée
-        def safe_int(value):
-            try:
-                if pd.isna(value):
-                    return 0
-                return int(value)
-            except:
-                return 0
-        
         # Première ligne de métriques
         col1, col2, col3 = st.columns(3)
         with col1:
-            create_metric_card("Rang", f"#{safe_int(user_data['Rang'])}")
+            create_metric_card("Rang", f"#{user_data['Rang']}")
         with col2:
             create_metric_card("Score Global", f"{user_data['Score global']:.1f} pts")
         with col3:
             # Affiche le nombre total de fichiers téléversés
-            create_metric_card("Fichiers téléversés", f"{safe_int(user_data['upload_count'])}")
+            create_metric_card("Fichiers téléversés", f"{user_data['upload_count']}")
             
         # Deuxième ligne de métriques
         col1, col2 = st.columns(2)
@@ -160,57 +347,70 @@ def create_contributor_profile(metrics: pd.DataFrame, contributor: str):
             # Affiche les points pour les fichiers (3 points par fichier)
             create_metric_card(
                 "Points fichiers",
-                f"{safe_int(user_data['upload_count']) * 3} (3 pts/fichier)"
+                f"{user_data['upload_count'] * 3} (3 pts/fichier)"
             )
         with col2:
             # Affiche le nombre de fichiers × 3 points
             create_metric_card(
                 "Calcul des points",
-                f"{safe_int(user_data['upload_count'])} × 3 pts"
+                f"{user_data['upload_count']} × 3 pts"
             )
             
         # Tableau détaillé des points
         st.markdown("### 📊 Détail des points")
-        points_data = {
-            "Type de contribution": [
-                "Fichiers téléversés"
-            ],
-            "Nombre": [
-                safe_int(user_data['upload_count'])
-            ],
+        upload_count = int(user_data['upload_count'])
+        # Tableau d'une ligne déjà formaté : ni DataFrame ni Styler à construire
+        st.table({
+            "Type de contribution": ["Fichiers téléversés"],
+            "Nombre": [upload_count],
             "Points par unité": [3],  # 3 points par fichier
-            "Total des points": [
-                float(safe_int(user_data['upload_count']) * 3)
-            ]
-        }
-        
-        points_df = pd.DataFrame(points_data)
-        
-        # Formatage du tableau avec gestion des valeurs NaN
-        st.table(points_df.style.format({
-            "Nombre": lambda x: f"{int(x) if not pd.isna(x) else 0}",
-            "Total des points": lambda x: f"{float(x):.1f}" if not pd.isna(x) else "0.0"
-        }))
+            "Total des points": [f"{upload_count * 3:.1f}"]
+        })
         
     except Exception as e:
         st.error(f"Erreur lors de la création du profil: {str(e)}")
         logger.error(f"Profile creation error: {e}")
         logger.error(f"User data: {user_data.to_dict() if 'user_data' in locals() else 'No user data'}")
 
+@st.cache_resource(show_spinner=False)
+def _build_leaderboard_fig(top10: tuple) -> go.Figure:
+    """Build the leaderboard bar chart from (username, score) pairs, best score first"""
+    usernames, scores = zip(*top10) if top10 else ((), ())
+    scores = np.asarray(scores, dtype=float)
+    fig = go.Figure(go.Bar(
+        x=scores,
+        y=np.asarray(usernames, dtype=object),
+        orientation="h",
+        marker=dict(
+            color=scores,
+            colorscale=[[0, "#1E40AF"], [1, "#10B981"]],
+            showscale=True,
+            colorbar=dict(title="Score global")
+        )
+    ))
+    fig.update_layout(template="plotly_white", title="Top 10 des contributeurs")
+    return fig
+
 def create_leaderboard_visualization(metrics: pd.DataFrame):
     """Create an interactive leaderboard visualization"""
-    fig = px.bar(
-        metrics.head(10),
-        x="Score global",
-        y="username",
-        orientation="h",
-        color="Score global",
-        color_continuous_scale=["#1E40AF", "#10B981"],
-        title="Top 10 des contributeurs"
-    )
-    fig.update_layout(template="plotly_white")
+    # Ordre croissant pour que le meilleur score apparaisse en haut du graphique horizontal
+    top = metrics.nlargest(10, "Score global").iloc[::-1]
+    top10 = tuple(zip(top["username"].to_numpy(), top["Score global"].to_numpy()))
+    fig = _build_leaderboard_fig(top10)
     st.plotly_chart(fig, use_container_width=True)
 
+@_fragment
+def contributor_section(metrics: pd.DataFrame, metrics_by_user: pd.DataFrame):
+    """Contributor selector and profile, rerun alone when the selection changes"""
+    st.markdown("## 👤 Détails par contributeur")
+    selected_user = st.selectbox(
+        "Sélectionner un contributeur",
+        options=metrics["username"].tolist()
+    )
+    
+    if selected_user:
+        create_contributor_profile(metrics_by_user, selected_user)
+
 def main():
     # Initialize session state
     initialize_session_state()
@@ -257,7 +457,7 @@ def main():
             
             # Analyze data
             try:
-                metrics = analyze_contributors(df, data_type=data_type)
+                metrics, metrics_by_user, score_summary = _analyze(df, data_type)
                 st.session_state.analysis_results = metrics
                 
                 # Display overview metrics
@@ -270,12 +470,12 @@ def main():
                 with col2:
                     create_metric_card(
                         "Score moyen",
-                        f"{metrics['Score global'].mean():.2f}"
+                        f"{score_summary['mean']:.2f}"
                     )
                 with col3:
                     create_metric_card(
                         "Score médian",
-                        f"{metrics['Score global'].median():.2f}"
+                        f"{score_summary['median']:.2f}"
                     )
                 
                 # Display leaderboard
@@ -283,14 +483,7 @@ def main():
                 create_leaderboard_visualization(metrics)
                 
                 # Contributor details
-                st.markdown("## 👤 Détails par contributeur")
-                selected_user = st.selectbox(
-                    "Sélectionner un contributeur",
-                    options=metrics["username"].tolist()
-                )
-                
-                if selected_user:
-                    create_contributor_profile(metrics, selected_user)
+                contributor_section(metrics, metrics_by_user)
                 
             except Exception as e:
                 st.error(f"Erreur lors de l'analyse : {str(e)}")
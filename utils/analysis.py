@@ -38,11 +38,67 @@ import numpy as np
 from dataclasses import dataclass
 from datetime import datetime
 import logging
+import weakref
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application
 logger = logging.getLogger(__name__)
 
+# Username-indexed views of metrics frames, keyed by id() and dropped with the frame
+_by_user_cache: Dict[int, tuple] = {}
+
+# Nanoseconds per day, for date arithmetic on int64 timestamps
+NS_PER_DAY = 86_400 * 10**9
+
+# Numeric columns every processed metrics frame must provide
+REQUIRED_NUMERIC = (
+    'bytes_added',
+    'articles_created',
+    'articles_edited',
+    'references_added',
+    'upload_count',
+    'www.wikidata.org_edits',
+    'total_edits'
+)
+
+# Overview columns kept as metrics: per-wiki suffixes and general totals
+OVERVIEW_WIKI_SUFFIXES = ('_edits', '_articles_created', '_articles_edited')
+OVERVIEW_GENERAL_METRICS = ('total_edits', 'articles_created', 'articles_edited', 'bytes_added', 'references_added', 'upload_count')
+
+# Integer range for count columns stored as int32
+INT32_INFO = np.iinfo(np.int32)
+
+# French column names accepted in editors data, with their English equivalents
+FRENCH_EDITORS_COLUMNS = {
+    "Nom d'utilisateur": "username",
+    "Utilisateur": "username",
+    "Date d'inscription": "enrollment_timestamp",
+    "Modifications pendant le projet": "revisions_during_project",
+    "Total modifications": "total_edits",
+    "Total éditions": "total_edits",
+    "Octets ajoutés (espace principal)": "mainspace_bytes_added",
+    "Octets ajoutés": "bytes_added",
+    "Références ajoutées": "references_added",
+    "Total articles créés": "total_articles_created",
+    "Articles créés": "articles_created",
+    "Total articles modifiés": "total_articles_edited",
+    "Articles modifiés": "articles_edited"
+}
+FRENCH_EDITORS_KEYS = frozenset(FRENCH_EDITORS_COLUMNS)
+
+# French column names accepted in overview data, with their English equivalents
+FRENCH_OVERVIEW_COLUMNS = {
+    "Contributeurs": "editors",
+    "Articles modifiés": "articles_edited",
+    "Articles créés": "articles_created",
+    "Octets ajoutés": "bytes_added",
+    "Références ajoutées": "references_added",
+    "Total modifications": "total_edits",
+    "Fichiers téléversés": "upload_count",
+    "Éditions Wikidata": "www.wikidata.org_edits",
+    "Total éditions": "total_edits"
+}
+FRENCH_OVERVIEW_KEYS = frozenset(FRENCH_OVERVIEW_COLUMNS)
+
 @dataclass
 class ContributorMetrics:
     """Data class for storing contributor metrics"""
@@ -68,34 +124,10 @@ def validate_editors_data(df: pd.DataFrame) -> bool:
         "username",  # or "Nom d'utilisateur"
     }
     
-    # Check if we have the required columns or their French equivalents
-    french_columns = {
-        "Nom d'utilisateur": "username",
-        "Utilisateur": "username",
-        "Date d'inscription": "enrollment_timestamp",
-        "Modifications pendant le projet": "revisions_during_project",
-        "Total modifications": "total_edits",
-        "Total éditions": "total_edits",
-        "Octets ajoutés (espace principal)": "mainspace_bytes_added",
-        "Octets ajoutés": "bytes_added",
-        "Références ajoutées": "references_added",
-        "Total articles créés": "total_articles_created",
-        "Articles créés": "articles_created",
-        "Total articles modifiés": "total_articles_edited",
-        "Articles modifiés": "articles_edited"
-    }
-    
-    # Create a set of available columns (both French and English)
+    # Available columns plus the English equivalents of French columns
     available_columns = set(df.columns)
-    english_columns = set()
-    
-    # Add English equivalents of French columns
-    for french_col, english_col in french_columns.items():
-        if french_col in available_columns:
-            english_columns.add(english_col)
-    
-    # Combine both sets
-    all_available_columns = available_columns.union(english_columns)
+    english_columns = {FRENCH_EDITORS_COLUMNS[col] for col in available_columns & FRENCH_EDITORS_KEYS}
+    all_available_columns = available_columns | english_columns
     
     # Check for minimum required columns
     missing = required_columns - all_available_columns
@@ -117,30 +149,10 @@ def validate_overview_data(df: pd.DataFrame) -> bool:
         "total_edits",  # or "Total modifications"
     }
     
-    # Check if we have the required columns or their French equivalents
-    french_columns = {
-        "Contributeurs": "editors",
-        "Articles modifiés": "articles_edited",
-        "Articles créés": "articles_created",
-        "Octets ajoutés": "bytes_added",
-        "Références ajoutées": "references_added",
-        "Total modifications": "total_edits",
-        "Fichiers téléversés": "upload_count",
-        "Éditions Wikidata": "www.wikidata.org_edits",
-        "Total éditions": "total_edits"
-    }
-    
-    # Create a set of available columns (both French and English)
+    # Available columns plus the English equivalents of French columns
     available_columns = set(df.columns)
-    english_columns = set()
-    
-    # Add English equivalents of French columns
-    for french_col, english_col in french_columns.items():
-        if french_col in available_columns:
-            english_columns.add(english_col)
-    
-    # Combine both sets
-    all_available_columns = available_columns.union(english_columns)
+    english_columns = {FRENCH_OVERVIEW_COLUMNS[col] for col in available_columns & FRENCH_OVERVIEW_KEYS}
+    all_available_columns = available_columns | english_columns
     
     # Check for minimum required columns
     missing = required_columns - all_available_columns
@@ -163,19 +175,42 @@ def calculate_time_bonus(df: pd.DataFrame) -> pd.Series:
     """Calculate time-based bonus for early contributors"""
     if 'enrollment_timestamp' in df.columns:
         try:
-            df['enrollment_timestamp'] = pd.to_datetime(df['enrollment_timestamp'])
-            time_range = (df['enrollment_timestamp'].max() - df['enrollment_timestamp'].min()).days
-            if time_range > 0:
-                return 1 + (0.1 * (1 - (df['enrollment_timestamp'] - df['enrollment_timestamp'].min()).dt.days / time_range))
+            # Enrollment dates as int64 nanoseconds; unparseable dates (NaT) get no bonus
+            timestamps = pd.to_datetime(df['enrollment_timestamp'], errors='coerce')
+            valid = timestamps.notna().to_numpy()
+            if valid.any():
+                ns = timestamps.to_numpy(dtype='datetime64[ns]').view('i8')
+                first = ns[valid].min()
+                # Whole days, as Timedelta.days would give
+                time_range = (ns[valid].max() - first) // NS_PER_DAY
+                if time_range > 0:
+                    elapsed_days = (ns - first) // NS_PER_DAY
+                    bonus = 1.0 + 0.1 * (1.0 - elapsed_days / time_range)
+                    return pd.Series(np.where(valid, bonus, 1.0), index=df.index)
         except Exception as e:
             logger.warning(f"Could not calculate time bonus: {e}")
     return pd.Series(1.0, index=df.index)
 
+def _fill_missing_counts(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Replace NaN with 0 in the float columns of a processed frame (single pass)"""
+    for col, dtype in metrics.dtypes.items():
+        if dtype.kind == 'f':
+            values = metrics[col].to_numpy()
+            if np.isnan(values).any():
+                metrics[col] = np.nan_to_num(values, copy=True)
+    return metrics
+
+def _downcast_counts(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Store integer count columns as int32 when all their values fit"""
+    for col in REQUIRED_NUMERIC:
+        if col in metrics.columns and metrics[col].dtype.kind in 'iu':
+            values = metrics[col].to_numpy()
+            if not len(values) or (values.min() >= INT32_INFO.min and values.max() <= INT32_INFO.max):
+                metrics[col] = values.astype(np.int32)
+    return metrics
+
 def process_editors_data(df: pd.DataFrame) -> pd.DataFrame:
     """Process editors data"""
-    metrics = pd.DataFrame()
-    metrics['username'] = df['username']
-    
     # Map columns with their English equivalents
     column_mappings = {
         'revisions_during_project': 'total_edits',
@@ -187,59 +222,39 @@ def process_editors_data(df: pd.DataFrame) -> pd.DataFrame:
         'www.wikidata.org_edits': 'www.wikidata.org_edits'
     }
     
-    # Copy existing columns and fill missing ones with 0
+    # Collect every column as an array (missing values and absent columns as 0),
+    # then build the frame in one go
+    columns = {'username': df['username'].array}
     for source, target in column_mappings.items():
         if source in df.columns:
-            metrics[target] = df[source].fillna(0)
+            columns[target] = df[source].to_numpy(na_value=0)
         else:
-            metrics[target] = 0
-    
-    # Ensure all required columns exist
-    required_columns = [
-        'bytes_added',
-        'articles_created',
-        'articles_edited',
-        'references_added',
-        'upload_count',
-        'www.wikidata.org_edits',
-        'total_edits'
-    ]
+            columns[target] = np.zeros(len(df), dtype=np.int64)
     
-    for col in required_columns:
-        if col not in metrics.columns:
-            metrics[col] = 0
-    
-    return metrics
+    return _downcast_counts(_fill_missing_counts(pd.DataFrame(columns, index=df.index, copy=False)))
 
 def process_overview_data(df: pd.DataFrame) -> pd.DataFrame:
     """Process overview data"""
-    metrics = pd.DataFrame()
-    
-    # Extract wiki-specific metrics
-    wiki_metrics = [col for col in df.columns if col.endswith('_edits') or col.endswith('_articles_created') or col.endswith('_articles_edited')]
+    # Wiki-specific metrics (vectorized suffix match), then the general metrics
+    wiki_metrics = df.columns[df.columns.str.endswith(OVERVIEW_WIKI_SUFFIXES, na=False)]
+    general_metrics = pd.Index(OVERVIEW_GENERAL_METRICS).intersection(df.columns, sort=False)
+    selected = wiki_metrics.append(general_metrics.difference(wiki_metrics, sort=False))
     
-    for metric in wiki_metrics:
-        if metric in df.columns:
-            metrics[metric] = df[metric].fillna(0)
+    # Single select, missing values as 0 (object columns keep their dtype)
+    with pd.option_context('future.no_silent_downcasting', True):
+        metrics = df[selected].fillna(0)
     
-    # Add general metrics
-    general_metrics = ['total_edits', 'articles_created', 'articles_edited', 'bytes_added', 'references_added', 'upload_count']
-    for metric in general_metrics:
-        if metric in df.columns:
-            metrics[metric] = df[metric].fillna(0)
-    
-    return metrics
+    return _downcast_counts(_fill_missing_counts(metrics))
 
 def process_commons_data(df: pd.DataFrame) -> pd.DataFrame:
     """Process commons uploads data"""
-    metrics = pd.DataFrame()
-    
     # Ensure we have the username column
     if 'username' not in df.columns:
         logger.warning("No username column found in commons data")
         return pd.DataFrame()
     
-    metrics['username'] = df['username']
+    # Usernames as categorical codes (only the Series is cast, not the whole frame)
+    usernames = df['username'].astype('category')
     
     # Initialize required columns with default values
     required_columns = {
@@ -252,52 +267,77 @@ def process_commons_data(df: pd.DataFrame) -> pd.DataFrame:
         'total_edits': 0
     }
     
+    columns = {'username': usernames.array}
     for col, default_val in required_columns.items():
-        metrics[col] = default_val
+        columns[col] = np.full(len(df), default_val, dtype=np.int64)
     
-    # Count uploads per user
+    # One integer code per row (-1 when the username is missing)
+    codes, uniques = pd.factorize(usernames, sort=False)
+    valid = codes >= 0
+    
+    # Count uploads per user, then gather each user's total back onto its rows
     if 'title' in df.columns:  # Assuming each row is an upload
-        upload_counts = df.groupby('username').size()
-        metrics.loc[metrics['username'].isin(upload_counts.index), 'upload_count'] = upload_counts
+        upload_counts = np.bincount(codes[valid], minlength=len(uniques))
+        columns['upload_count'] = np.where(valid, upload_counts[codes], 0)
     
     # If we have usage information, count it
     if 'usage_count' in df.columns:
-        usage_counts = df.groupby('username')['usage_count'].sum()
-        metrics.loc[metrics['username'].isin(usage_counts.index), 'articles_edited'] = usage_counts
+        usage = np.nan_to_num(df['usage_count'].to_numpy(dtype=np.float64)[valid])
+        usage_counts = np.bincount(codes[valid], weights=usage, minlength=len(uniques))
+        columns['articles_edited'] = np.where(valid, usage_counts[codes], 0)
     
-    return metrics
+    return _downcast_counts(_fill_missing_counts(pd.DataFrame(columns, index=df.index, copy=False)))
 
 def process_articles_data(df: pd.DataFrame) -> pd.DataFrame:
     """Process articles data"""
     if 'username' not in df.columns:
         return pd.DataFrame()
     
-    metrics = df.groupby('username').agg({
-        'edit_count': 'sum',
-        'characters_added': 'sum',
-        'references_added': 'sum',
-        'new': 'sum'  # Count of new articles
-    }).reset_index()
+    # Usernames as categorical codes (only the Series is cast, not the whole frame)
+    usernames = df['username'].astype('category')
     
-    metrics = metrics.rename(columns={
+    # Map summed columns to their final names
+    column_mappings = {
         'edit_count': 'total_edits',
         'characters_added': 'bytes_added',
-        'new': 'articles_created'
-    })
+        'references_added': 'references_added',
+        'new': 'articles_created'  # Count of new articles
+    }
     
-    return metrics
-
-def calculate_article_points(row) -> float:
-    """Calculate points for article creation based on bytes added and articles created"""
-    if row['articles_created'] == 0:
-        return 0.0
+    # One integer code per row; rows without a username are dropped, as groupby does
+    codes, uniques = pd.factorize(usernames, sort=False)
+    valid = codes >= 0
+    codes = codes[valid]
     
-    bytes_per_article = row['bytes_added'] / row['articles_created']
-    if bytes_per_article >= 4000:
-        return 5.0 * row['articles_created']
-    elif bytes_per_article >= 1500:
-        return 3.0 * row['articles_created']
-    return 0.0
+    # Per-user sums with np.bincount, one C loop per column
+    metrics = {'username': uniques}
+    for source, target in column_mappings.items():
+        values = df[source].to_numpy(dtype=np.float64)[valid]
+        sums = np.bincount(codes, weights=np.nan_to_num(values), minlength=len(uniques))
+        metrics[target] = sums.astype(np.int64) if df[source].dtype.kind in 'biu' else sums
+    
+    return _downcast_counts(_fill_missing_counts(pd.DataFrame(metrics)))
+
+def calculate_article_points(metrics: pd.DataFrame) -> np.ndarray:
+    """Calculate points for article creation based on bytes added and articles created (vectorized)"""
+    bytes_added = np.nan_to_num(metrics['bytes_added'].to_numpy(dtype=np.float64))
+    articles_created = np.nan_to_num(metrics['articles_created'].to_numpy(dtype=np.float64))
+    
+    bytes_per_article = np.divide(
+        bytes_added,
+        articles_created,
+        out=np.zeros(len(metrics)),
+        where=articles_created != 0
+    )
+    points_per_article = np.where(
+        bytes_per_article >= 4000, 5.0,
+        np.where(bytes_per_article >= 1500, 3.0, 0.0)
+    )
+    return points_per_article * articles_created
+
+def frame_fingerprint(df: pd.DataFrame) -> tuple:
+    """Cheap hashable fingerprint of a DataFrame's columns and content"""
+    return (tuple(df.columns), len(df), int(pd.util.hash_pandas_object(df, index=False).sum()))
 
 def analyze_contributors(
     df: pd.DataFrame,
@@ -333,54 +373,48 @@ def analyze_contributors(
             logger.warning(f"Unsupported data type: {data_type}")
             return pd.DataFrame()
         
-        # Ensure all required columns exist
-        required_columns = [
-            'bytes_added',
-            'articles_created',
-            'articles_edited',
-            'references_added',
-            'upload_count',
-            'www.wikidata.org_edits',
-            'total_edits'
-        ]
-        
-        for col in required_columns:
-            if col not in metrics.columns:
-                metrics[col] = 0
-            
-        # Calculate points for each contribution type
-        metrics['article_creation_points'] = metrics.apply(calculate_article_points, axis=1)
-        metrics['wikidata_points'] = metrics['www.wikidata.org_edits'].fillna(0) * 3  # 3 points per Wikidata item
-        metrics['upload_points'] = metrics['upload_count'].fillna(0) * 3  # 3 points per uploaded file
-        metrics['commons_usage_points'] = metrics['articles_edited'].fillna(0)  # 1 point per Commons photo use
+        # Add any missing required column (as 0) in a single reindex
+        missing = [col for col in REQUIRED_NUMERIC if col not in metrics.columns]
+        if missing:
+            metrics = metrics.reindex(columns=[*metrics.columns, *missing], fill_value=0)
         
-        # Calculate total score
+        # Calculate total score in a single expression over the raw arrays
+        # (NaN already replaced by 0 in process_*, no intermediate point columns)
+        wikidata_edits = metrics['www.wikidata.org_edits'].to_numpy(dtype=np.float64)
+        upload_count = metrics['upload_count'].to_numpy(dtype=np.float64)
+        commons_usage = metrics['articles_edited'].to_numpy(dtype=np.float64)
         metrics['Score global'] = (
-            metrics['article_creation_points'] +
-            metrics['wikidata_points'] +
-            metrics['upload_points'] +
-            metrics['commons_usage_points']
-        ).fillna(0)  # Ensure no NaN values in final score
+            calculate_article_points(metrics) +
+            3.0 * wikidata_edits +  # 3 points per Wikidata item
+            3.0 * upload_count +  # 3 points per uploaded file
+            commons_usage  # 1 point per Commons photo use
+        )
         
         # Apply time bonus if enabled
         if include_time_bonus and 'enrollment_timestamp' in df.columns:
             time_bonus = calculate_time_bonus(df)
             metrics['Score global'] *= time_bonus
         
-        # Sort by total score and add rank
-        metrics = metrics.sort_values('Score global', ascending=False)
-        metrics['Rang'] = range(1, len(metrics) + 1)
+        # Sort by total score (one permutation of the score array, gathered with take) and add rank
+        order = np.argsort(-metrics['Score global'].to_numpy(), kind='stable')
+        metrics = metrics.take(order)
+        metrics['Rang'] = np.arange(1, len(metrics) + 1, dtype=np.int32)
         
-        # Round numeric columns for display
-        numeric_cols = metrics.select_dtypes(include=[np.number]).columns
-        metrics[numeric_cols] = metrics[numeric_cols].round(2)
+        # Round float columns for display, in place (integer columns are already exact)
+        for col, dtype in metrics.dtypes.items():
+            if dtype.kind == 'f':
+                values = metrics[col].to_numpy()
+                if values.flags.writeable:
+                    np.round(values, 2, out=values)
+                else:
+                    metrics[col] = values.round(2)
         
-        # Log metrics for debugging
-        logger.info(f"Processed metrics for {data_type}:")
-        logger.info(f"Number of contributors: {len(metrics)}")
-        logger.info(f"Total uploads: {metrics['upload_count'].sum()}")
-        logger.info(f"Total points: {metrics['Score global'].sum()}")
-        logger.info(f"Sample of results:\n{metrics.head()}")
+        # Log metrics for debugging (sums only computed when DEBUG is enabled)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processed metrics for %s:", data_type)
+            logger.debug("Number of contributors: %s", len(metrics))
+            logger.debug("Total uploads: %s", metrics['upload_count'].sum())
+            logger.debug("Total points: %s", metrics['Score global'].sum())
         
         return metrics
 
@@ -390,13 +424,29 @@ def analyze_contributors(
         logger.error(f"Available columns: {df.columns.tolist()}")
         return pd.DataFrame()
 
+def index_by_username(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Metrics indexed by username, keeping the first row per user"""
+    return metrics.drop_duplicates('username').set_index('username', drop=False)
+
+def _metrics_by_user(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Metrics indexed by username, built once per frame"""
+    entry = _by_user_cache.get(id(metrics))
+    if entry is not None and entry[0]() is metrics:
+        return entry[1]
+    
+    by_user = index_by_username(metrics)
+    _by_user_cache[id(metrics)] = (weakref.ref(metrics), by_user)
+    weakref.finalize(metrics, _by_user_cache.pop, id(metrics), None)
+    return by_user
+
 def generate_contributor_summary(metrics: pd.DataFrame, contributor: str) -> ContributorMetrics:
     """Generate a summary for a specific contributor"""
     try:
-        if contributor not in metrics['username'].values:
+        by_user = _metrics_by_user(metrics)
+        if contributor not in by_user.index:
             return ContributorMetrics(username=contributor)
         
-        user_metrics = metrics[metrics["username"] == contributor].iloc[0]
+        user_metrics = by_user.loc[contributor]
         return ContributorMetrics(
             username=contributor,
             total_edits=int(user_metrics.get("total_edits", 0)),
@@ -1,4 +1,5 @@
 import streamlit as st
+import functools
 from pathlib import Path
 import plotly.express as px
 import plotly.graph_objects as go
@@ -16,13 +17,28 @@ COLORS = {
     'text': '#1F2937',  # Dark gray
 }
 
+# Radar chart axes and layout for contributor profiles
+_RADAR_CATEGORIES = (
+    "Articles créés", "Octets ajoutés", "Articles édités",
+    "Références ajoutées", "Fichiers téléversés", "Éditions Wikidata"
+)
+_RADAR_LAYOUT = {
+    "polar": {"radialaxis": {"visible": True}},
+    "showlegend": True
+}
+
+# Feuille de style statique, lue une seule fois par processus
+CSS_PATH = Path(__file__).parent.parent / "assets" / "css" / "tailwind.css"
+
+@functools.lru_cache(maxsize=1)
+def _css_text(path_str: str) -> str:
+    """Contenu du fichier CSS (mis en cache)"""
+    return Path(path_str).read_text()
+
 def load_css():
     """Charge dynamiquement les styles CSS avec fallback"""
-    css_path = Path(__file__).parent.parent / "assets" / "css" / "tailwind.css"
-    
-    if css_path.exists():
-        with open(css_path) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    if CSS_PATH.exists():
+        st.markdown(f"<style>{_css_text(str(CSS_PATH))}</style>", unsafe_allow_html=True)
     else:
         st.markdown("""
         <script src="/assets/js/tailwind.cdn.js"></script>
@@ -104,8 +120,8 @@ def create_leaderboard_visualization(metrics: pd.DataFrame):
         st.warning("Aucune donnée disponible pour la visualisation.")
         return
     
-    # Prepare data for visualization
-    top_contributors = metrics.head(10)
+    # Prepare data for visualization (partial selection, no full sort needed)
+    top_contributors = metrics.nlargest(10, "Score global")
     
     # Create bar chart for total score
     fig = go.Figure()
@@ -128,6 +144,39 @@ def create_leaderboard_visualization(metrics: pd.DataFrame):
     
     st.plotly_chart(fig, use_container_width=True)
 
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _radar_fig(username: str, values: tuple) -> go.Figure:
+    """Radar chart of a contributor's metrics (cached on username and values)"""
+    fig = go.Figure(go.Scatterpolar(
+        r=list(values),
+        theta=_RADAR_CATEGORIES,
+        fill='toself',
+        name=username
+    ))
+    
+    # Shared layout; only the radial range and the title depend on the contributor
+    fig.update_layout(
+        _RADAR_LAYOUT,
+        polar_radialaxis_range=[0, max(values)],
+        title=f"Profil de contribution de {username}"
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _pie_fig(values: tuple) -> go.Figure:
+    """Pie chart of contributions by type (cached on values)"""
+    contribution_data = {
+        "Type": ["Articles", "Références", "Fichiers", "Wikidata"],
+        "Valeur": list(values)
+    }
+    
+    return px.pie(
+        contribution_data,
+        values="Valeur",
+        names="Type",
+        title="Répartition des contributions par type"
+    )
+
 def create_contributor_profile(metrics: pd.DataFrame, username: str):
     """Create a detailed profile visualization for a specific contributor"""
     if metrics.empty or username not in metrics["username"].values:
@@ -137,48 +186,24 @@ def create_contributor_profile(metrics: pd.DataFrame, username: str):
     contributor_data = metrics[metrics["username"] == username].iloc[0]
     
     # Create radar chart for contributor metrics
-    categories = [
-        "Articles créés", "Octets ajoutés", "Articles édités",
-        "Références ajoutées", "Fichiers téléversés", "Éditions Wikidata"
-    ]
-    
-    values = [
+    values = (
         contributor_data.get("articles_created", 0),
         contributor_data.get("bytes_added", 0) / 1000,  # Convert to KB
         contributor_data.get("articles_edited", 0),
         contributor_data.get("references_added", 0),
         contributor_data.get("upload_count", 0),
         contributor_data.get("www.wikidata.org_edits", 0)
-    ]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values,
-        theta=categories,
-        fill='toself',
-        name=username
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, max(values)]
-            )
-        ),
-        showlegend=True,
-        title=f"Profil de contribution de {username}"
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(_radar_fig(username, values), use_container_width=True)
     
     # Display detailed metrics
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("### 📊 Statistiques détaillées")
-        metrics_table = pd.DataFrame({
+        # Tableau de 9 lignes passé directement à st.table, sans DataFrame intermédiaire
+        st.table({
             "Métrique": [
                 "Score global",
                 "Rang",
@@ -202,28 +227,17 @@ def create_contributor_profile(metrics: pd.DataFrame, username: str):
                 contributor_data.get("total_edits", 0)
             ]
         })
-        st.table(metrics_table)
     
     with col2:
         st.markdown("### 📈 Répartition des contributions")
-        contribution_data = {
-            "Type": ["Articles", "Références", "Fichiers", "Wikidata"],
-            "Valeur": [
-                contributor_data.get("articles_created", 0) + contributor_data.get("articles_edited", 0),
-                contributor_data.get("references_added", 0),
-                contributor_data.get("upload_count", 0),
-                contributor_data.get("www.wikidata.org_edits", 0)
-            ]
-        }
-        
-        fig = px.pie(
-            contribution_data,
-            values="Valeur",
-            names="Type",
-            title="Répartition des contributions par type"
+        contribution_values = (
+            contributor_data.get("articles_created", 0) + contributor_data.get("articles_edited", 0),
+            contributor_data.get("references_added", 0),
+            contributor_data.get("upload_count", 0),
+            contributor_data.get("www.wikidata.org_edits", 0)
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_pie_fig(contribution_values), use_container_width=True)
 
 def initialize_session_state():
     """Initialize session state variables"""